@@ -1,14 +1,41 @@
+import asyncio
 import json
+import os
 import pathlib
+import re
 import textwrap
-from functools import lru_cache
-from typing import Dict, List, Any, Optional, Tuple, Union
-import requests
+from collections import OrderedDict
+from functools import partial
+from itertools import islice
+from typing import Callable, Dict, List, Any, Optional, Tuple, Union
+import aiohttp
+from textual import work
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Container, ScrollableContainer
+from textual.widget import Widget
 from textual.widgets import Header, Footer, Button, Input, Static, Rule
 
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    _loads = json.loads
+
+WidgetFactory = Callable[[], Widget]
+
+_MARKUP_CHARS = re.compile(r"[\[\]{}<>*_`#|@]")
+_MARKUP_TRANS = str.maketrans({c: "\\" + c for c in "[]{}<>*_`#|@"})
+_WRAPPER = textwrap.TextWrapper(
+    width=80, break_long_words=False, break_on_hyphens=False
+)
+
 
 class SigmaDictionary(App):
     TITLE = "Sigma Dictionary"
@@ -16,6 +43,8 @@ class SigmaDictionary(App):
     API_URL = "https://api.dictionaryapi.dev/api/v2/entries/en/{}"
     MAX_CACHE_SIZE = 100
     MAX_HISTORY_SIZE = 50
+    MAX_RENDERED_SIZE = 10
+    FLUSH_INTERVAL = 5.0
 
     BINDINGS = [
         Binding("f1", "history", "History"),
@@ -34,183 +63,67 @@ class SigmaDictionary(App):
     HISTORY_EMPTY = "No search history available."
     CACHE_CLEARED = "Cache cleared successfully."
 
-    CSS = """
-    Screen {
-        background: #121212; 
-        color: #e0e0e0;
-    }
-    
-    Header {
-        dock: top; 
-        background: #1e1e1e; 
-        color: #ffffff; 
-        text-style: bold; 
-        padding: 1; 
-        height: 3;
-    }
-    
-    Footer {
-        dock: bottom; 
-        background: #1e1e1e; 
-        color: #ffffff; 
-        padding: 0; 
-        height: 1;
-    }
-    
-    .section-header {
-        padding: 1 2; 
-        margin: 1 0 0 0; 
-        text-style: bold; 
-        color: #bb86fc; 
-        background: #121212; 
-        border-bottom: solid #333333;
-    }
-    
-    #search-container {
-        layout: horizontal; 
-        height: 3; 
-        margin: 0 0 1 0; 
-        background: #1e1e1e; 
-        padding: 0 2;
-    }
-    
-    #search-input {
-        width: 80%; 
-        margin-right: 1; 
-        border: solid #333333; 
-        background: #2d2d2d; 
-        color: #e0e0e0;
-    }
-    
-    #search-button {
-        width: 20%; 
-        background: #bb86fc; 
-        color: #121212; 
-        height: 3; 
-        text-style: bold; 
-        content-align: center middle;
-    }
-    
-    #search-button:hover {
-        background: #03dac6; 
-        color: #121212;
-    }
-    
-    #results-container {
-        height: auto; 
-        margin: 0; 
-        background: #1e1e1e; 
-        padding: 0 2;
-    }
-    
-    .word-title {
-        color: #bb86fc; 
-        text-style: bold; 
-        margin: 1 0; 
-        text-align: center; 
-        width: 100%;
-    }
-    
-    .part-of-speech {
-        color: #03dac6; 
-        text-style: bold; 
-        margin-top: 1;
-    }
-    
-    .definition {
-        margin: 0 0 0 1; 
-        color: #e0e0e0;
-    }
-    
-    .example {
-        margin: 0 0 1 2; 
-        color: #a0a0a0; 
-        text-style: italic;
-    }
-    
-    .sub-section {
-        margin: 0 0 1 1; 
-        color: #a0a0a0;
-    }
-    
-    .history-title {
-        color: #bb86fc; 
-        text-style: bold; 
-        margin: 1 0; 
-        text-align: center; 
-        width: 100%;
-    }
-    
-    .history-item {
-        margin: 0 0 0 1; 
-        padding: 1 0; 
-        color: #e0e0e0;
-    }
-    
-    .error {
-        color: #cf6679; 
-        margin: 1 0; 
-        padding: 1;
-    }
-    
-    .success {
-        color: #03dac6; 
-        margin: 1 0; 
-        padding: 1;
-    }
-    
-    Button {
-        border: none;
-    }
-    
-    Button:hover {
-        background: #03dac6; 
-        color: #121212;
-    }
-    
-    .big-button {
-        width: 100%; 
-        height: 3; 
-        margin: 1 0; 
-        background: #bb86fc; 
-        color: #121212; 
-        text-style: bold; 
-        content-align: center middle;
-    }
-    
-    Rule {
-        color: #333333; 
-        height: 1;
-    }
-    """
+    CSS_PATH = pathlib.Path(__file__).parent / "sigmad.tcss"
 
     def __init__(self) -> None:
         super().__init__()
-        self.history: List[str] = []
-        self.cache: Dict[str, Any] = {}
+        self.history: "OrderedDict[str, None]" = OrderedDict()
+        self.cache: "OrderedDict[str, Any]" = OrderedDict()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._results: Optional[ScrollableContainer] = None
+        self._search_input: Optional[Input] = None
+        self._history_dirty = False
+        self._cache_dirty = False
+        self._rendered: "OrderedDict[str, List[WidgetFactory]]" = OrderedDict()
+        self._loaded_event = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
         self._setup_storage()
 
+    async def on_mount(self) -> None:
+        self._results = self.query_one("#results-container", ScrollableContainer)
+        self._search_input = self.query_one("#search-input", Input)
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=10),
+        )
+        self.set_interval(self.FLUSH_INTERVAL, self._flush_dirty)
+        self.run_worker(self._load_data(), group="storage")
+
+    async def on_unmount(self) -> None:
+        await self._flush_dirty()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
     def _setup_storage(self) -> None:
         app_dir = pathlib.Path(__file__).parent
         self.sigmad_dir = app_dir / ".sigmad"
         self.sigmad_dir.mkdir(exist_ok=True)
         self.history_file = self.sigmad_dir / "history.json"
         self.cache_file = self.sigmad_dir / "cache.json"
-        self._load_data()
 
-    def _load_data(self) -> None:
-        self._load_history()
-        self._load_cache()
+    async def _load_data(self) -> None:
+        await asyncio.gather(
+            asyncio.to_thread(self._load_history),
+            asyncio.to_thread(self._load_cache),
+        )
+        self._loaded_event.set()
 
     def _load_history(self) -> None:
-        self.history = self._load_json_file(
-            self.history_file, default=[], limit=self.MAX_HISTORY_SIZE
+        self.history = OrderedDict.fromkeys(
+            self._load_json_file(
+                self.history_file, default=[], limit=self.MAX_HISTORY_SIZE
+            )
         )
 
     def _load_cache(self) -> None:
-        self.cache = self._load_json_file(
+        cache = self._load_json_file(
             self.cache_file, default={}, limit=self.MAX_CACHE_SIZE
         )
+        self.cache = OrderedDict(
+            (word, self._compact(data)) for word, data in cache.items()
+        )
+        self._cache_dirty = self.cache != cache
 
     def _load_json_file(
         self, file_path: pathlib.Path, default: Union[List, Dict], limit: int = 0
@@ -219,48 +132,107 @@ class SigmaDictionary(App):
             return default
 
         try:
-            with open(file_path, "r") as f:
-                data = json.load(f)
+            data = _loads(file_path.read_bytes())
 
-                if isinstance(data, list) and limit > 0 and len(data) > limit:
-                    return data[-limit:]
+            if not isinstance(data, type(default)):
+                return default
 
-                if isinstance(data, dict) and limit > 0 and len(data) > limit:
-                    return dict(list(data.items())[-limit:])
+            if isinstance(data, list) and limit > 0 and len(data) > limit:
+                return data[-limit:]
 
-                return data
+            if isinstance(data, dict) and limit > 0 and len(data) > limit:
+                return dict(islice(data.items(), len(data) - limit, None))
+
+            return data
         except (json.JSONDecodeError, IOError):
             return default
 
-    def _save_json_file(self, file_path: pathlib.Path, data: Union[List, Dict]) -> bool:
+    @staticmethod
+    def _write_json_file(file_path: pathlib.Path, data: Union[List, Dict]) -> None:
+        payload = _dumps(data)
+        tmp_path = file_path.with_suffix(file_path.suffix + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, file_path)
+
+    async def _save_json_file(
+        self, file_path: pathlib.Path, data: Union[List, Dict]
+    ) -> bool:
         try:
-            with open(file_path, "w") as f:
-                json.dump(data, f)
+            await asyncio.to_thread(self._write_json_file, file_path, data)
             return True
         except IOError as e:
             self.show_message(f"Failed to save to {file_path.name}: {e}", error=True)
             return False
 
-    def _save_history(self) -> None:
-        self._save_json_file(self.history_file, self.history)
-
-    def _save_cache(self) -> None:
-        self._save_json_file(self.cache_file, self.cache)
+    async def _save_history(self) -> bool:
+        return await self._save_json_file(self.history_file, list(self.history))
+
+    async def _save_cache(self) -> bool:
+        return await self._save_json_file(self.cache_file, dict(self.cache))
+
+    async def _flush_dirty(self) -> bool:
+        async with self._flush_lock:
+            history_dirty, cache_dirty = self._history_dirty, self._cache_dirty
+            self._history_dirty = self._cache_dirty = False
+            saves = []
+            if history_dirty:
+                saves.append(self._save_history())
+            if cache_dirty:
+                saves.append(self._save_cache())
+
+            saved = iter(await asyncio.gather(*saves))
+            history_saved = next(saved) if history_dirty else True
+            cache_saved = next(saved) if cache_dirty else True
+            if not history_saved:
+                self._history_dirty = True
+            if not cache_saved:
+                self._cache_dirty = True
+            return history_saved and cache_saved
 
     def _add_to_history(self, word: str) -> None:
         if word in self.history:
-            self.history.remove(word)
-        self.history.append(word)
-        if len(self.history) > self.MAX_HISTORY_SIZE:
-            self.history = self.history[-self.MAX_HISTORY_SIZE :]
-        self._save_history()
+            self.history.move_to_end(word)
+        else:
+            self.history[word] = None
+            if len(self.history) > self.MAX_HISTORY_SIZE:
+                self.history.popitem(last=False)
+        self._history_dirty = True
 
     def _add_to_cache(self, word: str, data: Dict[str, Any]) -> None:
-        self.cache[word] = data
-        if len(self.cache) > self.MAX_CACHE_SIZE:
-            oldest_key = next(iter(self.cache))
-            del self.cache[oldest_key]
-        self._save_cache()
+        if word in self.cache:
+            self.cache.move_to_end(word)
+        else:
+            self.cache[word] = data
+            if len(self.cache) > self.MAX_CACHE_SIZE:
+                self.cache.popitem(last=False)
+        self._cache_dirty = True
+
+    @staticmethod
+    def _compact(data: Dict[str, Any]) -> Dict[str, Any]:
+        meanings = []
+        for meaning in data.get("meanings", []):
+            definitions = []
+            for definition in meaning.get("definitions", []):
+                compact_definition = {"definition": definition.get("definition", "")}
+                if example := definition.get("example"):
+                    compact_definition["example"] = example
+                definitions.append(compact_definition)
+            meanings.append(
+                {
+                    "partOfSpeech": meaning.get("partOfSpeech", ""),
+                    "definitions": definitions,
+                    "synonyms": meaning.get("synonyms", [])[:5],
+                    "antonyms": meaning.get("antonyms", [])[:5],
+                }
+            )
+
+        compact = {"word": data.get("word", "Unknown"), "meanings": meanings}
+        if phonetic := data.get("phonetic"):
+            compact["phonetic"] = phonetic
+        return compact
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -272,65 +244,64 @@ class SigmaDictionary(App):
         yield ScrollableContainer(id="results-container")
         yield Footer()
 
-    def on_button_pressed(self, event: Button.Pressed) -> None:
+    async def on_button_pressed(self, event: Button.Pressed) -> None:
         button_id = event.button.id
         if button_id == "search-button":
             self.search_word()
         elif button_id == "clear-history":
-            self._clear_history()
+            await self._clear_history()
 
     def on_input_submitted(self, event: Input.Submitted) -> None:
         if event.input.id == "search-input":
             self.search_word()
 
-    def _clear_history(self) -> None:
-        self.history = []
-        self._save_history()
-        self.action_history()
+    async def _clear_history(self) -> None:
+        await self._loaded_event.wait()
+        self.history.clear()
+        self._history_dirty = True
+        await self._flush_dirty()
+        await self.action_history()
 
     def show_message(
         self, message: str, error: bool = False, success: bool = False
     ) -> None:
-        container = self.query_one("#results-container", ScrollableContainer)
-        container.remove_children()
+        self._results.remove_children()
 
         classes = "error" if error else "success" if success else None
-        container.mount(Static(message, classes=classes))
+        self._results.mount(Static(message, classes=classes))
 
     def _search_specific_word(self, word: str) -> None:
-        search_input = self.query_one("#search-input", Input)
-        search_input.value = word
+        self._search_input.value = word
         self.search_word()
 
-    @lru_cache(maxsize=5)
-    def _fetch_word_data(
+    async def _fetch_word_data(
         self, word: str
     ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         try:
-            response = requests.get(self.API_URL.format(word), timeout=10)
-
-            if response.status_code == 200:
-                data = response.json()
-                if data:
-                    return data[0], None
-                return None, self.ERROR_WORD_NOT_FOUND.format(word=word)
-            elif response.status_code == 404:
-                return None, self.ERROR_WORD_NOT_FOUND.format(word=word)
-            else:
-                return None, self.ERROR_API_RESPONSE.format(
-                    status_code=response.status_code
-                )
-
-        except requests.exceptions.RequestException as e:
+            async with self._session.get(self.API_URL.format(word)) as response:
+                if response.status == 200:
+                    data = await response.json(content_type=None)
+                    if data:
+                        return data[0], None
+                    return None, self.ERROR_WORD_NOT_FOUND.format(word=word)
+                elif response.status == 404:
+                    return None, self.ERROR_WORD_NOT_FOUND.format(word=word)
+                else:
+                    return None, self.ERROR_API_RESPONSE.format(
+                        status_code=response.status
+                    )
+
+        except (aiohttp.ClientError, TimeoutError) as e:
             return None, self.ERROR_NETWORK.format(error=e)
         except json.JSONDecodeError:
             return None, self.ERROR_JSON_DECODE
         except Exception as e:
             return None, self.ERROR_UNEXPECTED.format(error=e)
 
-    def search_word(self) -> None:
-        search_input = self.query_one("#search-input", Input)
-        word = search_input.value.strip().lower()
+    @work(exclusive=True, group="search")
+    async def search_word(self) -> None:
+        await self._loaded_event.wait()
+        word = self._search_input.value.strip().lower()
 
         if not word:
             self.show_message(self.ERROR_EMPTY_SEARCH, error=True)
@@ -339,125 +310,137 @@ class SigmaDictionary(App):
         self._add_to_history(word)
 
         if word in self.cache:
+            self.cache.move_to_end(word)
+            self._cache_dirty = True
             self.show_message(f"Found '{word}' in cache")
-            self.display_definition(self.cache[word])
+            self.display_definition(word, self.cache[word])
             return
 
         self.show_message(f"Searching for '{word}'...")
 
-        data, error = self._fetch_word_data(word)
+        data, error = await self._fetch_word_data(word)
 
         if error:
             self.show_message(error, error=True)
             return
 
         if data:
+            data = self._compact(data)
             self._add_to_cache(word, data)
-            self.display_definition(data)
+            self.display_definition(word, data)
+
+    def display_definition(self, word: str, data: Dict[str, Any]) -> None:
+        factories = self._rendered.get(word)
+        if factories is None:
+            factories = self._render_definition(data)
+            self._rendered[word] = factories
+            if len(self._rendered) > self.MAX_RENDERED_SIZE:
+                self._rendered.popitem(last=False)
+        else:
+            self._rendered.move_to_end(word)
 
-    def display_definition(self, data: Dict[str, Any]) -> None:
-        container = self.query_one("#results-container", ScrollableContainer)
-        container.remove_children()
+        self._results.remove_children()
+        self._results.mount_all([factory() for factory in factories])
 
+    def _render_definition(self, data: Dict[str, Any]) -> List[WidgetFactory]:
         word = data.get("word", "Unknown")
         phonetics = data.get("phonetic", "")
 
-        container.mount(Static(f"{word.upper()}", classes="word-title"))
+        factories: List[WidgetFactory] = [
+            partial(Static, f"{word.upper()}", classes="word-title")
+        ]
         if phonetics:
             safe_phonetics = self._escape_markup(phonetics)
-            container.mount(Static(f"{safe_phonetics}", classes="definition"))
+            factories.append(partial(Static, f"{safe_phonetics}", classes="definition"))
 
-        container.mount(Rule())
-        self._display_meanings(container, data.get("meanings", []))
+        factories.append(Rule)
+        factories.extend(self._display_meanings(data.get("meanings", [])))
+        return factories
 
     @staticmethod
     def _escape_markup(text: str) -> str:
         if not isinstance(text, str):
             return str(text)
+        if _MARKUP_CHARS.search(text) is None:
+            return text
+        return text.translate(_MARKUP_TRANS)
 
-        replacements = {
-            "[": "\\[",
-            "]": "\\]",
-            "{": "\\{",
-            "}": "\\}",
-            "<": "\\<",
-            ">": "\\>",
-            "*": "\\*",
-            "_": "\\_",
-            "`": "\\`",
-            "#": "\\#",
-            "|": "\\|",
-            "@": "\\@",
-        }
-
-        for char, replacement in replacements.items():
-            text = text.replace(char, replacement)
-        return text
-
-    def _display_meanings(
-        self, container: ScrollableContainer, meanings: List[Dict[str, Any]]
-    ) -> None:
+    def _display_meanings(self, meanings: List[Dict[str, Any]]) -> List[WidgetFactory]:
+        factories: List[WidgetFactory] = []
         for i, meaning in enumerate(meanings, 1):
-            part_of_speech = meaning.get("partOfSpeech", "")
-            container.mount(
-                Static(f"{part_of_speech.upper()}", classes="part-of-speech")
+            part_of_speech = meaning["partOfSpeech"]
+            factories.append(
+                partial(Static, f"{part_of_speech.upper()}", classes="part-of-speech")
             )
-            self._display_definitions(container, meaning.get("definitions", []))
-            self._display_related_words(
-                container,
-                synonyms=meaning.get("synonyms", []),
-                antonyms=meaning.get("antonyms", []),
+            factories.extend(self._display_definitions(meaning["definitions"]))
+            factories.extend(
+                self._display_related_words(
+                    synonyms=meaning["synonyms"],
+                    antonyms=meaning["antonyms"],
+                )
             )
             if i < len(meanings):
-                container.mount(Rule())
+                factories.append(Rule)
+        return factories
 
     def _display_definitions(
-        self, container: ScrollableContainer, definitions: List[Dict[str, Any]]
-    ) -> None:
+        self, definitions: List[Dict[str, Any]]
+    ) -> List[WidgetFactory]:
+        factories: List[WidgetFactory] = []
         for j, definition in enumerate(definitions, 1):
-            def_text = definition.get("definition", "")
+            def_text = definition["definition"]
             if not def_text:
                 continue
 
-            wrapped_text = textwrap.fill(def_text, width=80)
-            container.mount(Static(f"{j}. {wrapped_text}", classes="definition"))
+            wrapped_text = _WRAPPER.fill(def_text)
+            factories.append(
+                partial(Static, f"{j}. {wrapped_text}", classes="definition")
+            )
 
             if example := definition.get("example"):
                 safe_example = self._escape_markup(example)
-                container.mount(Static(f'Example: "{safe_example}"', classes="example"))
+                factories.append(
+                    partial(Static, f'Example: "{safe_example}"', classes="example")
+                )
+        return factories
 
     def _display_related_words(
-        self, container: ScrollableContainer, synonyms: List[str], antonyms: List[str]
-    ) -> None:
+        self, synonyms: List[str], antonyms: List[str]
+    ) -> List[WidgetFactory]:
+        factories: List[WidgetFactory] = []
         if synonyms:
-            container.mount(
-                Static(
+            factories.append(
+                partial(
+                    Static,
                     f"Synonyms: {', '.join(synonyms[:5])}",
                     classes="definition sub-section",
                 )
             )
         if antonyms:
-            container.mount(
-                Static(
+            factories.append(
+                partial(
+                    Static,
                     f"Antonyms: {', '.join(antonyms[:5])}",
                     classes="definition sub-section",
                 )
             )
+        return factories
 
-    def action_history(self) -> None:
-        results = self.query_one("#results-container")
-        results.remove_children()
-        results.mount(Static("Search History", classes="history-title"))
-        results.mount(Rule())
+    async def action_history(self) -> None:
+        await self._loaded_event.wait()
+        widgets: List[Widget] = [
+            Static("Search History", classes="history-title"),
+            Rule(),
+        ]
 
         if not self.history:
-            results.mount(Static(self.HISTORY_EMPTY, classes="history-item"))
+            widgets.append(Static(self.HISTORY_EMPTY, classes="history-item"))
         else:
             for i, word in enumerate(reversed(self.history), 1):
-                results.mount(Static(f"{i}. {word}", classes="history-item"))
+                widgets.append(Static(f"{i}. {word}", classes="history-item"))
 
-            results.mount(Rule())
-            results.mount(
+            widgets.append(Rule())
+            widgets.append(
                 Button(
                     "Clear History",
                     variant="default",
@@ -466,12 +449,17 @@ class SigmaDictionary(App):
                 )
             )
 
-    def action_clear_cache(self) -> None:
+        await self._results.remove_children()
+        self._results.mount_all(widgets)
+
+    async def action_clear_cache(self) -> None:
+        await self._loaded_event.wait()
         try:
-            self.cache = {}
-            self._save_cache()
-            self._fetch_word_data.cache_clear()
-            self.show_message(self.CACHE_CLEARED, success=True)
+            self.cache.clear()
+            self._rendered.clear()
+            self._cache_dirty = True
+            if await self._flush_dirty():
+                self.show_message(self.CACHE_CLEARED, success=True)
         except Exception as e:
             self.show_message(self.ERROR_CACHE_CLEAR.format(error=e), error=True)
 